@@ -28,7 +28,7 @@ class AnomalyWatcher:
     It sleeps for an interval (specified in the config), wakes up and
     drains the queue. It computes the masks to separate events for each
     anomaly type and conducts anomaly analysis. Queues the anomaly
-    action type to the anomalyActionQueue.
+    action type to the LogCollector's action_queue.
     """
 
     def __init__(self, controller):
@@ -51,22 +51,18 @@ class AnomalyWatcher:
             try:
                 anomaly_type_enum = AnomalyType(anomaly_cfg.type.strip().lower())
             except ValueError:
-                print(
-                    f"[AnomalyWatcher] Warning: Unknown anomaly type '{anomaly_cfg.type}' for '{anomaly_name}'"
-                )
+                logger.warning("Unknown anomaly type '%s' for '%s'", anomaly_cfg.type, anomaly_name)
                 continue
 
             handler_class = ANOMALY_HANDLER_REGISTRY.get(anomaly_type_enum)
             if handler_class:
                 handler_map[anomaly_type_enum] = handler_class(anomaly_cfg)
             else:
-                print(
-                    f"[AnomalyWatcher] Warning: No handler registered for anomaly type '{anomaly_cfg.type}'"
-                )
+                logger.warning("No handler registered for anomaly type '%s'", anomaly_cfg.type)
         return handler_map
 
     def run(self) -> None:
-        """Loop: poll eventQueue, detect anomalies, and put actions into anomalyActionQueue"""
+        """Loop: poll eventQueue, detect anomalies, and hand actions to LogCollector.enqueue()"""
         if __debug__:
             total_anomalies_detected = 0
             batch_count = 0
@@ -75,8 +71,7 @@ class AnomalyWatcher:
         while True:
             batch = self.controller.eventQueue.get(True)
             if batch is None:
-                self.controller.eventQueue.task_done()
-                self.controller.anomalyActionQueue.put(None)
+                self.controller.log_collector_manager.enqueue(None)
                 break  # Exit loop on sentinel
 
             end_time = time.time() + MAX_WAIT
@@ -85,11 +80,9 @@ class AnomalyWatcher:
                 try:
                     next_batch = self.controller.eventQueue.get_nowait()
                     if next_batch is None:
-                        self.controller.eventQueue.task_done()
                         sentinal_found = True
                         break  # Exit inner loop immediately on sentinel
                     batch = np.concatenate((batch, next_batch))
-                    self.controller.eventQueue.task_done()
                 except queue.Empty:
                     break
 
@@ -117,17 +110,18 @@ class AnomalyWatcher:
                 if len(masked_batch) > 0 and handler.detect(masked_batch):
                     action = self._generate_action(anomaly_type)
                     syslog.syslog(syslog.LOG_ALERT, f"AOD detected anomaly: {anomaly_type.value} with {len(masked_batch)} events")
-                    self.controller.anomalyActionQueue.put(action)
+                    self.controller.log_collector_manager.enqueue(action)
                     if __debug__:
                         total_anomalies_detected += 1
                         self.anomaly_counts[anomaly_type] += 1
                         logger.info("Anomaly detected: %s (%d events analyzed)", anomaly_type.value, len(masked_batch))
 
-            self.controller.eventQueue.task_done()
             if sentinal_found:
-                self.controller.anomalyActionQueue.put(None)
+                self.controller.log_collector_manager.enqueue(None)
                 break
-            time.sleep(self.interval)
+            # After stop() this no longer waits, so the remaining batches and the
+            # sentinel are drained without sleeping an interval between each
+            self.controller.stop_event.wait(self.interval)
         
         if __debug__:
             avg_latency_ms = (float(total_latency) / float(self.total_count) / 1_000_000) if self.total_count > 0 else 0
@@ -96,6 +96,8 @@ class ConfigManager:
             guardian=guardian,
             cleanup=config_data["cleanup"],
             audit=config_data["audit"],
+            dispatcher_core=config_data.get("dispatcher_core"),
+            dispatcher_rt_priority=config_data.get("dispatcher_rt_priority"),
         )
 
     def _check_codes(self, codes, all_codes, code_type):
@@ -10,9 +10,6 @@ import subprocess
 import os
 import signal
 from functools import partial
-import time
-import ctypes
-import ctypes.util
 import logging
 import syslog
 
@@ -23,18 +20,22 @@ from EventDispatcher import EventDispatcher
 from AnomalyWatcher import AnomalyWatcher
 from LogCollector import LogCollector
 from SpaceWatcher import SpaceWatcher
-from utils.pdeathsig_wrapper import pdeathsig_preexec
+from utils.pdeathsig_wrapper import _libc, pdeathsig_preexec
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on waiting for in-flight log collections at shutdown
+LOG_COLLECTOR_SHUTDOWN_TIMEOUT = 30
+
 
 def set_thread_name(name):
     """Set thread name visible in htop when pressing H to show threads."""
+    if _libc is None:
+        return
     try:
-        libc = ctypes.CDLL(ctypes.util.find_library("c"))
         # Limit name to 15 characters (Linux kernel limit)
         name = name[:15].encode('utf-8')
-        libc.prctl(15, name, 0, 0, 0)  # PR_SET_NAME = 15
+        _libc.prctl(15, name, 0, 0, 0)  # PR_SET_NAME = 15
     except Exception:
         pass
 
@@ -56,8 +57,9 @@ class Controller:
         if __debug__:
             self.thread_restarts = 0
             self.process_restarts = 0
-        self.eventQueue = queue.Queue()
-        self.anomalyActionQueue = queue.Queue()
+        # One producer, one consumer and nobody join()s it: SimpleQueue skips
+        # Queue's condition variables and unfinished-task accounting
+        self.eventQueue = queue.SimpleQueue()
         self.tool_processes = {}
         self.tool_cmd_builders = {
             "smbslower": self._get_smbsloweraod_cmd,
@@ -88,7 +90,7 @@ class Controller:
                     if __debug__:
                         logger.debug("Full traceback:", exc_info=True)
                         self.thread_restarts += 1
-                    time.sleep(1)  # Wait before restarting
+                    self.stop_event.wait(1)  # Wait before restarting
                     if __debug__:
                         logger.info("Restarting %s thread", thread_name)
                     syslog.syslog(syslog.LOG_WARNING, f"AOD component {thread_name} restarted due to unexpected exit")
@@ -106,6 +108,9 @@ class Controller:
             cmd = cmd_builder()
             process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.DEVNULL,
+                # fds are non-inheritable by default (PEP 446); skip the fd walk
+                close_fds=False,
                 start_new_session=True,
                 preexec_fn=pdeathsig_preexec
             )
@@ -131,7 +136,7 @@ class Controller:
                 except RuntimeError:
                     logger.warning("%s process did not stop gracefully", process_name)
                 break
-            time.sleep(1)
+            self.stop_event.wait(1)
 
     def _get_smbsloweraod_cmd(self) -> list[str]:
         """Get command array for the smbsloweraod process based on the latency
@@ -156,9 +161,11 @@ class Controller:
     def _shutdown(self) -> None:
         """Shutdown all threads and components gracefully."""
 
-        # Wait for all queues to be processed
-        self.eventQueue.join()
-        self.anomalyActionQueue.join()
+        # Wait for all queues to be processed. The event sentinel is forwarded to
+        # LogCollector only after every batch ahead of it, so `finished` covers both.
+        if not self.log_collector_manager.finished.wait(timeout=LOG_COLLECTOR_SHUTDOWN_TIMEOUT):
+            logger.warning("LogCollector did not finish within %ds, shutting down anyway",
+                           LOG_COLLECTOR_SHUTDOWN_TIMEOUT)
 
         for thread in self.threads:
             thread.join(timeout=5)
@@ -224,6 +231,9 @@ def main():
 
     # add arguments later
 
+    # Connect to /dev/log once up front so restart/anomaly alerts are a single send()
+    syslog.openlog(logoption=syslog.LOG_PID | syslog.LOG_NDELAY)
+
     # Use the config path relative to this file, as in controller_draft.py
     config_path = os.path.join(os.path.dirname(__file__), "../config/config.yaml")
     controller = Controller(config_path)
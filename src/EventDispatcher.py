@@ -13,6 +13,12 @@ from shared_data import SHM_NAME, SHM_SIZE, SHM_DATA_SIZE, HEAD_TAIL_BYTES, even
 
 logger = logging.getLogger(__name__)
 
+# Layout invariants of the ring, resolved once instead of on every poll
+EVENT_SIZE = event_dtype.itemsize
+_HT_FMT = "Q" if HEAD_TAIL_BYTES == 8 else "I"
+_HEAD_TAIL = struct.Struct(f"<{_HT_FMT}{_HT_FMT}")
+_TAIL = struct.Struct(f"<{_HT_FMT}")
+
 # Ensure that the size of Event and event_dtype is same
 # assert ctypes.sizeof(Event) == event_dtype.itemsize, (
 #     f"Size mismatch: ctypes Event is {ctypes.sizeof(Event)} bytes, "
@@ -30,10 +36,14 @@ class EventDispatcher:
     def __init__(self, controller):
         """Initialize the EventDispatcher."""
         self.controller = controller
-        self.head_tail_fmt = "<Q" if HEAD_TAIL_BYTES == 8 else "<I"
         if __debug__:
             logger.info("EventDispatcher initialized, shared memory: %s", SHM_NAME)
         self.shm_fd, self.shm_map = self._setup_shared_memory()
+        # Byte view over the ring's data area, built once. Events can straddle the
+        # wrap point, so it is sliced by byte offset and re-typed per batch.
+        self._ring = np.frombuffer(
+            self.shm_map, dtype=np.uint8, count=SHM_DATA_SIZE, offset=2 * HEAD_TAIL_BYTES
+        )
 
     def _setup_shared_memory(self) -> tuple[int, mmap.mmap]:
         """Open, create, size, and memory-map the shared memory segment.
@@ -41,33 +51,33 @@ class EventDispatcher:
         Returns:
             Tuple[int, mmap.mmap]: The file descriptor and mmap object.
         """
-        shm_created = False
         shm_file_path = f"/dev/shm{SHM_NAME}"
         try:
-            shm_fd = os.open(shm_file_path, os.O_RDWR)
-            if __debug__:
-                logger.info("Opened existing shared memory: %s", shm_file_path)
-        except FileNotFoundError:
-            # This is expected on first startup - create new shared memory
-            if __debug__:
-                logger.info("Shared memory not found, creating new: %s", shm_file_path)
+            # O_CREAT is idempotent, so one open covers both the first-start and reattach cases
             shm_fd = os.open(shm_file_path, os.O_RDWR | os.O_CREAT, 0o666)
-            shm_created = True
         except Exception as e:
             logger.error("Failed to open shared memory: %s", e)
             raise
 
-        if shm_created:
-            try:
+        try:
+            if os.fstat(shm_fd).st_size < SHM_SIZE:
+                if __debug__:
+                    logger.info("Sizing new shared memory segment: %s", shm_file_path)
                 os.ftruncate(shm_fd, SHM_SIZE)
-            except Exception as e:
-                logger.error("Failed to set size of shared memory: %s", e)
-                os.close(shm_fd)
-                raise
+            elif __debug__:
+                logger.info("Opened existing shared memory: %s", shm_file_path)
+        except Exception as e:
+            logger.error("Failed to set size of shared memory: %s", e)
+            os.close(shm_fd)
+            raise
 
         try:
+            # MAP_POPULATE prefaults the whole ring so polling never takes first-touch faults
             shm_map = mmap.mmap(
-                shm_fd, SHM_SIZE, flags=mmap.MAP_SHARED, prot=mmap.PROT_READ | mmap.PROT_WRITE
+                shm_fd,
+                SHM_SIZE,
+                flags=mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0),
+                prot=mmap.PROT_READ | mmap.PROT_WRITE,
             )
         except Exception as e:
             logger.error("Failed to map shared memory: %s", e)
@@ -78,9 +88,7 @@ class EventDispatcher:
 
     def _get_buffer_size(self) -> int:
         """Tells how much data is available in the shared memory buffer."""
-        self.shm_map.seek(0)
-        head = struct.unpack_from(self.head_tail_fmt, self.shm_map, 0)[0]
-        tail = struct.unpack_from(self.head_tail_fmt, self.shm_map, HEAD_TAIL_BYTES)[0]
+        head, tail = _HEAD_TAIL.unpack_from(self.shm_map, 0)
         if tail == head:
             return 0
         if tail < head:
@@ -89,9 +97,10 @@ class EventDispatcher:
         return (SHM_DATA_SIZE - tail) + head
 
     def run(self) -> None:
-        """Loop: poll eventQueue, detect anomalies, and put actions into anomalyActionQueue"""
+        """Loop: read events from the shared memory ring and put them into eventQueue"""
         if __debug__:
             logger.info("EventDispatcher started running")
+        self._pin_thread()
         timer = 3
         if __debug__:
             total_events_processed = 0
@@ -99,7 +108,7 @@ class EventDispatcher:
             total_latency = 0
         
         while not self.controller.stop_event.is_set():
-            no_of_events = self._get_buffer_size() // event_dtype.itemsize
+            no_of_events = self._get_buffer_size() // EVENT_SIZE
             if no_of_events >= 10 or timer == 0:
                 timer = 3  # reset timer
                 if no_of_events == 0:
@@ -130,7 +139,7 @@ class EventDispatcher:
                         logger.debug("EventDispatcher metrics: batches=%d, total_events=%d, avg_per_batch=%.1f, avg_latency=%.2fms", 
                                    batch_count, total_events_processed, avg_events_per_batch, avg_latency_ms)
             else:
-                time.sleep(1)
+                self.controller.stop_event.wait(1)  # returns early on shutdown
                 timer -= 1
         
         if __debug__:
@@ -139,46 +148,59 @@ class EventDispatcher:
                        batch_count, total_events_processed, avg_latency_ms)
         self.controller.eventQueue.put(None) #send sentinal to the queue
 
-    def _poll_shm_buffer(self) -> bytes:
-        """Fetch a batch of raw events from shared memory."""
+    def _pin_thread(self) -> None:
+        """Pin the polling thread to the configured core and optionally switch it
+        to SCHED_FIFO, keeping the ring hot in that core's caches.
 
-        self.shm_map.seek(0)
-        head = struct.unpack_from(self.head_tail_fmt, self.shm_map, 0)[0]
-        tail = struct.unpack_from(self.head_tail_fmt, self.shm_map, HEAD_TAIL_BYTES)[0]
+        Raising the priority needs CAP_SYS_NICE; failures only log a warning.
+        """
+        core = self.controller.config.dispatcher_core
+        if core is not None:
+            try:
+                os.sched_setaffinity(0, {core})  # pid 0 is the calling thread
+                if __debug__:
+                    logger.info("EventDispatcher pinned to CPU %d", core)
+            except (AttributeError, OSError, TypeError, ValueError) as e:
+                logger.warning("Could not pin EventDispatcher to CPU %s: %s", core, e)
+
+        priority = self.controller.config.dispatcher_rt_priority
+        if priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+                if __debug__:
+                    logger.info("EventDispatcher running with SCHED_FIFO priority %d", priority)
+            except (AttributeError, OSError, TypeError, ValueError) as e:
+                logger.warning("Could not set SCHED_FIFO priority %s for EventDispatcher: %s", priority, e)
+
+    def _poll_shm_buffer(self) -> np.ndarray:
+        """Fetch a batch of raw events from shared memory.
+
+        Returns a private copy of the pending bytes, so the producer can reuse
+        the ring slots as soon as the tail is advanced.
+        """
+        head, tail = _HEAD_TAIL.unpack_from(self.shm_map, 0)
 
         if tail == head:
             # no events to read
-            return b""
+            return self._ring[:0]
 
         if tail < head:
-            available_bytes = head - tail
-            self.shm_map.seek(2 * HEAD_TAIL_BYTES + tail)
-            raw = self.shm_map.read(available_bytes)
-            tail = (tail + available_bytes) % SHM_DATA_SIZE
-            self._update_tail(tail)
-            return raw
-
-        # Wrap-around case
-        available_bytes = (SHM_DATA_SIZE - tail) + head
-        bytes_to_end = SHM_DATA_SIZE - tail
-        self.shm_map.seek(2 * HEAD_TAIL_BYTES + tail)
-        raw1 = self.shm_map.read(bytes_to_end)
-        self.shm_map.seek(2 * HEAD_TAIL_BYTES)
-        raw2 = self.shm_map.read(head)
-        tail = (tail + available_bytes) % SHM_DATA_SIZE
-        self._update_tail(tail)
-        return raw1 + raw2
+            raw = self._ring[tail:head].copy()
+        else:
+            # Wrap-around case
+            raw = np.concatenate((self._ring[tail:], self._ring[:head]))
+        self._update_tail(head)
+        return raw
 
     def _update_tail(self, tail) -> None:
-        self.shm_map.seek(HEAD_TAIL_BYTES)
-        self.shm_map.write(struct.pack(self.head_tail_fmt, tail))
+        _TAIL.pack_into(self.shm_map, HEAD_TAIL_BYTES, tail)
         self.shm_map.flush()
 
-    def _parse(self, raw: bytes) -> np.ndarray | None:
-        """Convert raw struct bytes to a numpy array of events (batch)."""
-        if not raw:
+    def _parse(self, raw: np.ndarray) -> np.ndarray | None:
+        """Reinterpret the raw ring bytes as a numpy array of events (batch)."""
+        if raw.size == 0:
             return None
-        return np.frombuffer(raw, dtype=event_dtype)
+        return raw.view(event_dtype)
 
     def cleanup(self) -> None:
         """Clean up resources used by the EventDispatcher."""
@@ -186,13 +208,12 @@ class EventDispatcher:
         # Shared memory cleanup
         try:
             # Read head and tail before closing mmap
-            self.shm_map.seek(0)
-            head = struct.unpack_from(self.head_tail_fmt, self.shm_map, 0)[0]
-            tail = struct.unpack_from(self.head_tail_fmt, self.shm_map, 8)[0]
+            head, tail = _HEAD_TAIL.unpack_from(self.shm_map, 0)
             if head != tail:
                 logger.warning("Head and tail are not equal, indicating potential data loss (head=%d, tail=%d)", 
                              head, tail)
 
+            self._ring = None  # release the exported buffer, mmap refuses to close otherwise
             self.shm_map.close()
             os.close(self.shm_fd)
             os.unlink(f"/dev/shm{SHM_NAME}")
@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import queue
 import tarfile
+import threading
 import shutil
 import time
 import os
@@ -21,6 +23,11 @@ class LogCollector:
     
     def __init__(self, controller):
         self.loop = asyncio.new_event_loop()
+        # Anomaly events for this loop. Only code running on self.loop touches it;
+        # other threads hand events over through enqueue(). asyncio.Queue binds to
+        # the loop that first waits on it, which is always self.loop.
+        self.action_queue = asyncio.Queue()
+        self.finished = threading.Event()  # set once the sentinel was processed and all tasks are done
         self.max_concurrent_tasks = 4
         self.controller = controller
         self.anomaly_interval = getattr(self.controller.config, "watch_interval_sec", 1)  # 1 second default
@@ -47,14 +54,23 @@ class LogCollector:
         """
         Build a mapping from anomaly type to a list of action instances,
         using the 'actions' field from each anomaly config in the loaded config.
+        Anomalies that list the same action share a single instance.
         """
         anomaly_events = {}
+        # Quick actions only hold their output settings (all calls run on self.loop),
+        # so one instance per action name is shared by every anomaly that lists it.
+        action_instances = {}
         for anomaly_name, anomaly_cfg in config.guardian.anomalies.items():
             actions = []
             for action_name in getattr(anomaly_cfg, "actions", []):
+                action = action_instances.get(action_name)
+                if action is not None:
+                    actions.append(action)
+                    continue
                 factory = self.action_factory.get(action_name)
                 if factory is not None:
-                    actions.append(factory())
+                    action = action_instances[action_name] = factory()
+                    actions.append(action)
                 else:
                     logger.warning("No factory for action '%s' in anomaly '%s'", action_name, anomaly_name)
             try:
@@ -66,7 +82,11 @@ class LogCollector:
 
     async def _create_log_collection_task(self, anomaly_event) -> None:
         """ here we wait for the logs to be collected.
-        After that, we should compress the logs using zstd for faster compression. """
+        After that, we should compress the logs using zstd for faster compression.
+
+        There are no marker files: while a batch is being collected its staging
+        directory aod_quick_<id>/ exists, and once it is gone only the finished
+        aod_quick_<id>.tar.zst remains. """
         if __debug__:
             logger.info("Collecting logs for anomaly event %s", anomaly_event)
         anomaly_type = anomaly_event["anomaly"]
@@ -78,20 +98,63 @@ class LogCollector:
                 logger.warning("No handlers configured for anomaly type %s, skipping collection", anomaly_type)
             return
 
-        await asyncio.gather(
-            *[handler.execute(batch_id) for handler in handlers]
-        )
-        output_path = self.handlers[anomaly_type][0].get_output_dir(batch_id)
-        
-        # Compress the logs using tar + zstd (faster than gzip)
+        output_path = handlers[0].get_output_dir(batch_id)
+        arc_dir = os.path.basename(output_path)
+        try:
+            os.mkdir(output_path)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            # batches root doesn't exist yet (first batch) or was removed
+            os.makedirs(output_path, exist_ok=True)
+
+        # Compress the logs using tar + zstd (faster than gzip).
+        # Each log is appended as soon as its action finishes, so archiving overlaps
+        # with the slower collectors instead of waiting for all of them.
         tar_path = f"{output_path}.tar.zst"
+        log_paths = queue.SimpleQueue()
+        # The archive lives entirely on one worker thread: adding, compressing and
+        # the final flush/close never run on the loop the other batches share
+        archiver = asyncio.create_task(asyncio.to_thread(self._write_archive, tar_path, arc_dir, log_paths))
+        tasks = [asyncio.create_task(handler.execute(output_path)) for handler in handlers]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                log_path = await finished
+                if log_path is not None:
+                    log_paths.put(log_path)
+        finally:
+            # On failure, stop the remaining actions before their staging dir goes away
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            log_paths.put(None)  # no more logs; the archiver closes the stream
+            try:
+                await archiver
+            finally:
+                try:
+                    os.rmdir(output_path)
+                except OSError:
+                    # an action or the archiver failed, leaving files behind
+                    shutil.rmtree(output_path, ignore_errors=True)
+
+    @staticmethod
+    def _write_archive(tar_path: str, arc_dir: str, log_paths: queue.SimpleQueue) -> None:
+        """Write the batch archive, adding each staged log from log_paths until None.
+
+        Runs on a worker thread for the archive's whole lifetime. Each staged
+        log is dropped once it has been added.
+        """
         with open(tar_path, 'wb') as f:
-            cctx = zstd.ZstdCompressor(level=3)  # Level 3 for good speed/compression balance
+            # Level 3 for good speed/compression balance. Single-threaded: the
+            # logs are small and up to max_concurrent_tasks batches run at once
+            cctx = zstd.ZstdCompressor(level=3)
             with cctx.stream_writer(f) as writer:
                 with tarfile.open(fileobj=writer, mode='w|') as tar:
-                    tar.add(output_path, arcname=os.path.basename(output_path))
-        
-        shutil.rmtree(output_path)
+                    while (log_path := log_paths.get()) is not None:
+                        tar.add(log_path, arcname=os.path.join(arc_dir, os.path.basename(log_path)))
+                        os.unlink(log_path)  # archived, the staged copy is no longer needed
 
     async def _create_log_collection_task_with_limit(self, anomaly_event, semaphore: asyncio.Semaphore) -> None:
         # use the with ... statement so that we do not have to manually release the semaphore
@@ -105,38 +168,53 @@ class LogCollector:
                 if __debug__:
                     self.tasks_failed += 1
             finally:
-                # send a task done signal to the queue
-                await asyncio.to_thread(self.controller.anomalyActionQueue.task_done)
-                
                 # Log metrics every 10 tasks
                 if __debug__ and (self.tasks_processed + self.tasks_failed) % 10 == 0:
                     success_rate = (self.tasks_processed / (self.tasks_processed + self.tasks_failed) * 100) if (self.tasks_processed + self.tasks_failed) > 0 else 0
                     logger.debug("LogCollector metrics: processed=%d, failed=%d, success_rate=%.1f%%", 
                                self.tasks_processed, self.tasks_failed, success_rate)
 
+    def _drain(self, first_event) -> tuple[list, bool]:
+        """Take everything already queued behind first_event.
+
+        Returns the events to collect and whether the stop sentinel was seen.
+        """
+        action_queue = self.action_queue
+        drained = [first_event]
+        while not action_queue.empty():
+            drained.append(action_queue.get_nowait())
+
+        stop = None in drained  # Sentinel to stop the loop
+        return [anomaly_event for anomaly_event in drained if anomaly_event is not None], stop
+
     async def _run(self):
         currently_running_tasks = set()
         semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
 
-        while True:
+        stop = False
+        while not stop:
             try:
-                anomaly_event = await asyncio.to_thread(self.controller.anomalyActionQueue.get) # we can afford to block here since we send a poison pill when the script stops
-                if anomaly_event is None:  # Sentinel to stop the loop
-                    self.controller.anomalyActionQueue.task_done()
-                    # send sentinal to LogCompressor queue when integrated
-                    break
-                task = asyncio.create_task(self._create_log_collection_task_with_limit(anomaly_event, semaphore))
-                currently_running_tasks.add(task)
-                # remove task from the set when done
-                task.add_done_callback(currently_running_tasks.discard)
+                first_event = await self.action_queue.get() # a poison pill is sent when the script stops
+                anomaly_events, stop = self._drain(first_event)
+                for anomaly_event in anomaly_events:
+                    task = asyncio.create_task(self._create_log_collection_task_with_limit(anomaly_event, semaphore))
+                    currently_running_tasks.add(task)
+                    # remove task from the set when done
+                    task.add_done_callback(currently_running_tasks.discard)
             except Exception as e:
                 logger.error("Error while processing anomaly event: %s", e)
+        # send sentinal to LogCompressor queue when integrated
             
         if currently_running_tasks:
             await asyncio.gather(*currently_running_tasks) # wait for all tasks to finish
 
+    def enqueue(self, anomaly_event) -> None:
+        """Thread-safe hand-off of an anomaly event (or the None sentinel) to the collector loop."""
+        self.loop.call_soon_threadsafe(self.action_queue.put_nowait, anomaly_event)
+
     def run(self):
         # run forever
         asyncio.set_event_loop(self.loop)
         self.loop.run_until_complete(self._run()) # Runner.run() is meant for the main thread, so we use run_until_complete()
-        self.loop.close()
\ No newline at end of file
+        self.loop.close()
+        self.finished.set()
\ No newline at end of file
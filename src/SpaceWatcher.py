@@ -3,13 +3,40 @@
 import logging
 import time
 import os
-import shutil
-from pathlib import Path
-import numpy as np
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 SIZE_DELETE_THRESHOLD = 0.5
 
+# batches/ layout the scans rely on, at most two levels deep:
+#   batches/aod_quick_<ts>.tar.zst   finished batch archive (LogCollector)
+#   batches/aod_quick_<ts>/<log>     staging directory of a batch in progress
+# Only aod_* entries and compressed files directly inside an aod_* directory
+# are looked at, so revisit _scan_batches/_iter_compressed if it gets deeper.
+
+
+def _rmtree_at(path: str, dir_fd: int | None = None) -> None:
+    """Remove a directory tree, unlinking each entry relative to its parent's fd.
+
+    Unlike removing by full path, the kernel never re-resolves the leading
+    components (unlinkat), and d_type from scandir saves an lstat per entry.
+    Batch dirs hold only regular files we wrote; O_NOFOLLOW still refuses to
+    descend through a symlink.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dir_fd)
+    try:
+        with os.scandir(fd) as it:
+            entries = [(e.name, e.is_dir(follow_symlinks=False)) for e in it]
+        for name, is_dir in entries:
+            if is_dir:
+                _rmtree_at(name, fd)
+            else:
+                os.unlink(name, dir_fd=fd)
+    finally:
+        os.close(fd)
+    os.rmdir(path, dir_fd=dir_fd)
+
+
 class SpaceWatcher:
     """Wake up every 10 minutes and check the size of the output dir. 
     If it grows over a certain threshold, clean up older logs to bring the usage down to a safe threshold. 
@@ -25,11 +52,23 @@ class SpaceWatcher:
         self.max_total_log_size_mb = cleanup_config.get("max_total_log_size_mb", 200)  # Default to 200 MB if not set
         self.cleanup_interval = cleanup_config.get("cleanup_interval_sec", 60)  # Default to 60 sec if not set
         self.aod_output_dir = cleanup_config.get("aod_output_dir", "/var/log/aod")  # Default to /var/log/aod if not set
-        self.batches_dir = Path(os.path.join(self.aod_output_dir, "batches"))
-        self.last_full_cleanup = time.time() - self.max_log_age_days * 24 * 60 * 60  # Initialize to ensure first cleanup runs immediately
+        self.batches_dir = os.path.join(self.aod_output_dir, "batches")
+        # Limits in the units the scans compare against, converted once
+        self._max_age_seconds = self.max_log_age_days * 24 * 60 * 60
+        self._max_bytes = self.max_total_log_size_mb * 1024 * 1024
+        # Monotonic, so clock jumps can't trigger or delay the periodic age cleanup
+        self._next_full_cleanup = time.monotonic()  # Initialize to ensure first cleanup runs immediately
         
         # Compression configuration - matches LogCollector's compression method
         self.compression_extension = ".tar.zst"  # Could be made configurable via config file
+        # Last _collect_batches() result and the batches/ mtime it was taken at
+        self._snapshot: list[tuple[str, float, int, bool]] = []
+        self._snapshot_signature: int | None = None
+        # Deleted batch directories are renamed here and removed on idle ticks.
+        # ".trash" doesn't match aod_*, so nothing in it is counted or re-deleted.
+        self._graveyard = os.path.join(self.batches_dir, ".trash")
+        self._trash_seq = 0
+        self._over_threshold = False  # last _check_space() result, for logging transitions
         
         # Metrics tracking
         if __debug__:
@@ -43,63 +82,200 @@ class SpaceWatcher:
         """Periodically checks disk space and triggers cleanup if needed."""
         if __debug__:
             logger.info("SpaceWatcher started running")
-        while not self.controller.stop_event.is_set():
+        stop_event = self.controller.stop_event
+        while not stop_event.is_set():
             try:
-                if self._check_space():
-                    self.cleanup_by_size()
-                if self._full_cleanup_needed():
-                    self.cleanup_by_age()
+                busy = False
+                age_due = self._full_cleanup_needed()
+                if age_due or self._quota_reachable():
+                    # One scan per tick; the space check and both cleanups share it
+                    batches = self._collect_batches()
+                    if self._check_space(batches):
+                        self.cleanup_by_size(batches)
+                        busy = True
+                    if age_due:
+                        self.cleanup_by_age(batches)
+                        busy = True
+                else:
+                    self._over_threshold = False  # statvfs proved we're under
+                if not busy:
+                    self._reap_graveyard()
             except Exception as e:
                 logger.error("SpaceWatcher cleanup failed: %s", e)
                 if __debug__:
                     logger.debug("Full traceback:", exc_info=True)
-            time.sleep(self.cleanup_interval)
+            # Wakes immediately on shutdown instead of finishing the interval
+            stop_event.wait(self.cleanup_interval)
 
     def _full_cleanup_needed(self) -> bool:
-        """Check if current time  > last_full_cleanup + max_log_age_days."""
-        current_time = time.time()
-        if (
-            current_time - self.last_full_cleanup > self.max_log_age_days * 24 * 60 * 60
-        ):  # Convert days to seconds
-            self.last_full_cleanup = current_time
+        """Check if max_log_age_days have passed (monotonic clock) since the last full cleanup."""
+        now = time.monotonic()
+        if now >= self._next_full_cleanup:
+            self._next_full_cleanup = now + self._max_age_seconds
             return True
         return False
 
-    def _check_space(self) -> bool:
-        """Check if disk space is below a threshold using pathlib, only counting compressed files."""
+    def _iter_compressed(self, root: str):
+        """Yield a DirEntry for every compressed file directly inside root.
+
+        Only one level is scanned (see the batches/ layout note at the top of
+        the module). A directory that vanishes or can't be read is skipped.
+        """
+        suffix = self.compression_extension
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError:
+            return
+
+    def _batch_info(self, entry: os.DirEntry) -> tuple[float, int, bool]:
+        """Return (mtime, size, is_dir) for one top-level batch entry.
+
+        A batch directory is a staging dir, so its compressed size is normally
+        0; it is still walked so stray archives inside one are counted.
+        """
+        mtime = entry.stat().st_mtime
+        if not entry.is_dir(follow_symlinks=False):
+            size = entry.stat().st_size if entry.name.endswith(self.compression_extension) else 0
+            return mtime, size, False
+        size = sum(f.stat().st_size for f in self._iter_compressed(entry.path))
+        return mtime, size, True
+
+    def _scan_batches(self):
+        """Yield (path, mtime, size, is_dir) for every aod_* entry in batches/.
+
+        Size only counts compressed files. Entries removed or unreadable since
+        the scan started are skipped.
+        """
+        try:
+            with os.scandir(self.batches_dir) as it:
+                for entry in it:
+                    if not entry.name.startswith("aod_"):
+                        continue
+                    try:
+                        info = self._batch_info(entry)
+                    except (FileNotFoundError, PermissionError, OSError):
+                        continue
+                    yield (entry.path, *info)
+        except FileNotFoundError:
+            return
+
+    def _quota_reachable(self) -> bool:
+        """Return False when the archives can't be over the 90% mark, without a scan.
+
+        The archives can't occupy more than the bytes in use on their
+        filesystem, so if statvfs reports less than 90% of
+        max_total_log_size_mb in use, _check_space can't trigger. Archives are
+        already zstd-compressed, so filesystem-level compression doesn't
+        shrink them below their st_size.
+        """
         try:
-            total_size = sum(f.stat().st_size for f in self.batches_dir.glob(f"**/*{self.compression_extension}") if f.is_file())
-            total_size_mb = total_size / (1024 * 1024)
-            max_size_mb = self.max_total_log_size_mb
+            st = os.statvfs(self.batches_dir)
+        except OSError:
+            return True  # can't tell; fall back to scanning
+        used_bytes = (st.f_blocks - st.f_bfree) * st.f_frsize
+        return used_bytes > 0.9 * self._max_bytes
 
+    def _check_space(self, batches: list[tuple[str, float, int, bool]]) -> bool:
+        """Check if disk space is below a threshold, only counting compressed files.
+
+        batches is this tick's _collect_batches() snapshot.
+        """
+        threshold = 0.9 * self._max_bytes
+        total_size = 0
+        for batch in batches:
+            total_size += batch[2]
             # Normal warning mode: disk approaching full (90% of limit)
-            if total_size > 0.9 * max_size_mb * 1024 * 1024:
-                logger.warning("Total log size %.2f MB exceeds 90%% of max %.2f MB", total_size_mb, max_size_mb)
+            if total_size > threshold:
+                # Warn when crossing the threshold, not on every tick it stays over
+                if not self._over_threshold:
+                    self._over_threshold = True
+                    logger.warning("Total log size %.2f MB exceeds 90%% of max %.2f MB",
+                                   total_size / (1024 * 1024), self.max_total_log_size_mb)
+                elif __debug__:
+                    logger.debug("Total log size still above 90%% of max %.2f MB", self.max_total_log_size_mb)
                 return True
-            
-            # Normal operation
-            else:
-                return False
-                
-        except (FileNotFoundError, PermissionError, OSError) as e:
-            logger.warning("Error checking space: %s", e)
-            return False
 
-    def cleanup_by_age(self) -> None:
-        """Delete batch directories or files older than max_log_age_days days using numpy for efficiency."""
+        # Normal operation
+        if self._over_threshold:
+            self._over_threshold = False
+            logger.info("Total log size %.2f MB back under 90%% of max %.2f MB",
+                        total_size / (1024 * 1024), self.max_total_log_size_mb)
+        return False
+
+    def _collect_batches(self) -> list[tuple[str, float, int, bool]]:
+        """Stat every aod_* batch entry once.
+
+        Returns (path, mtime, size, is_dir) tuples sorted oldest first, where
+        size only counts compressed files. The space check and both cleanups
+        work from this list; the cleanups drop the entries they delete from it.
+
+        Adding, removing or renaming an aod_* entry (including LogCollector
+        removing a staging directory once its archive is complete) bumps the
+        mtime of batches/ itself, so while that is unchanged the previous
+        snapshot is still accurate and is returned without a scan. The one
+        exception is an archive that is still being written: it grows without
+        touching batches/. Its staging directory exists for as long as that
+        lasts, so a snapshot holding any directory entry is never reused.
+        """
         try:
-            cutoff = time.time() - self.max_log_age_days * 24 * 60 * 60
-            entries = list(self.batches_dir.glob("aod_*"))
-            if not entries:
-                if __debug__:
-                    logger.debug("No AOD batch entries to cleanup by age")
-                return
+            signature = os.stat(self.batches_dir).st_mtime_ns  # taken before the scan
+        except FileNotFoundError:
+            return []
+        if signature == self._snapshot_signature:
+            return list(self._snapshot)
+        batches = list(self._scan_batches())
+        batches.sort(key=itemgetter(1))
+        in_progress = any(batch[3] for batch in batches)
+        self._snapshot_signature = None if in_progress else signature
+        self._snapshot = batches
+        return list(batches)
+
+    def _discard(self, path: str, is_dir: bool) -> None:
+        """Remove a batch entry. Files are unlinked; directories are renamed into
+        the graveyard in O(1) and reaped later by _reap_graveyard()."""
+        if not is_dir:
+            os.unlink(path)
+            return
+        self._trash_seq += 1
+        # pid keeps names unique against leftovers from a previous run
+        target = os.path.join(self._graveyard, f"{os.path.basename(path)}.{os.getpid()}.{self._trash_seq}")
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            os.makedirs(self._graveyard, exist_ok=True)
+            os.rename(path, target)
+
+    def _reap_graveyard(self) -> None:
+        """Remove one directory from the graveyard; called on ticks with no cleanup to do."""
+        try:
+            with os.scandir(self._graveyard) as it:
+                entry = next(it, None)
+        except FileNotFoundError:
+            return
+        if entry is None:
+            return
+        try:
+            _rmtree_at(entry.path) if entry.is_dir(follow_symlinks=False) else os.unlink(entry.path)
+            if __debug__:
+                logger.debug("Reaped %s", entry.path)
+        except (FileNotFoundError, PermissionError, OSError) as e:
+            logger.warning("Failed to reap %s: %s", entry.path, e)
+
+    def cleanup_by_age(self, batches: list[tuple[str, float, int, bool]] | None = None) -> None:
+        """Delete batch directories or files older than max_log_age_days days.
 
-            # Filter entries that are older than the cutoffs
-            entries = np.array(entries)
-            to_delete = entries[np.array([e.stat().st_mtime for e in entries]) < cutoff]
+        batches is a _collect_batches() snapshot (taken here if not given).
+        """
+        try:
+            if batches is None:
+                batches = self._collect_batches()
+            cutoff = time.time() - self._max_age_seconds  # mtimes are wall-clock
+            to_delete = [batch for batch in batches if batch[1] < cutoff]
 
-            if len(to_delete) == 0:
+            if not to_delete:
                 if __debug__:
                     logger.debug("No AOD batch entries to cleanup by age")
                 return
@@ -107,18 +283,23 @@ class SpaceWatcher:
             if __debug__:
                 deleted_count = 0
                 space_freed_bytes = 0
+                # checked once so the per-entry debug() below isn't even called when filtered
+                debug_entries = logger.isEnabledFor(logging.DEBUG)
                 
-            for entry in to_delete:
+            deleted = set()
+            for path, _, size, is_dir in to_delete:
                 try:
-                    if __debug__:
-                        size = entry.stat().st_size if entry.is_file() and entry.name.endswith(self.compression_extension) else sum(f.stat().st_size for f in entry.glob(f"**/*{self.compression_extension}") if f.is_file())
-                    shutil.rmtree(entry) if entry.is_dir() else entry.unlink()
+                    self._discard(path, is_dir)
+                    deleted.add(path)
                     if __debug__:
                         deleted_count += 1
                         space_freed_bytes += size
-                        logger.debug("Deleted old batch entry %s (%.1f KB)", entry, size / 1024)
+                        if debug_entries:
+                            logger.debug("Deleted old batch entry %s (%.1f KB)", path, size / 1024)
                 except (FileNotFoundError, PermissionError, OSError) as e:
-                    logger.warning("Failed to delete %s: %s", entry, e)
+                    logger.warning("Failed to delete %s: %s", path, e)
+            if deleted:
+                batches[:] = [batch for batch in batches if batch[0] not in deleted]
             
             if __debug__:
                 self.cleanup_runs += 1
@@ -131,31 +312,23 @@ class SpaceWatcher:
             if __debug__:
                 logger.debug("Full traceback:", exc_info=True)
 
-    def cleanup_by_size(self) -> None:
-        """Delete oldest files or directories starting with aod_ until total size is under max_total_log_size_mb."""
+    def cleanup_by_size(self, batches: list[tuple[str, float, int, bool]] | None = None) -> None:
+        """Delete oldest files or directories starting with aod_ until total size is under max_total_log_size_mb.
+
+        In-progress batch directories are skipped; cleanup_by_age still removes
+        ones left behind by a crash. batches is a _collect_batches() snapshot (taken here if not given).
+        """
         try:
-            entries = list(self.batches_dir.glob("aod_*"))
-            if not entries:
+            # Sorted by modification time (oldest first)
+            if batches is None:
+                batches = self._collect_batches()
+            if not batches:
                 if __debug__:
                     logger.debug("No eligible AOD entries to cleanup by size")
                 return
 
-            # Sort entries by modification time (oldest first)
-            entries = np.array(entries)
-            entries = entries[np.argsort([e.stat().st_mtime for e in entries])]
-
-            # Calculate sizes
-            def entry_size(e):
-                try:
-                    if e.is_file():
-                        return e.stat().st_size if e.name.endswith(self.compression_extension) else 0
-                    else:
-                        return sum(f.stat().st_size for f in e.glob(f"**/*{self.compression_extension}") if f.is_file())
-                except (FileNotFoundError, PermissionError, OSError):
-                    return 0
-
-            total_size = sum(entry_size(e) for e in entries)
-            max_allowed_bytes = self.max_total_log_size_mb * 1024 * 1024
+            total_size = sum(batch[2] for batch in batches)
+            max_allowed_bytes = self._max_bytes
             if __debug__:
                 logger.info("Total size of AOD entries: %.2f MB, max allowed: %.2f MB", 
                        total_size / (1024 * 1024), self.max_total_log_size_mb)
@@ -163,20 +336,30 @@ class SpaceWatcher:
             if __debug__:
                 deleted_count = 0
                 space_freed_bytes = 0
+                # checked once so the per-entry debug() below isn't even called when filtered
+                debug_entries = logger.isEnabledFor(logging.DEBUG)
                 
-            for entry in entries:
+            deleted = set()
+            for path, _, size, is_dir in batches:
                 if total_size <= max_allowed_bytes * SIZE_DELETE_THRESHOLD:
                     break
-                size = entry_size(entry)
+                if is_dir:
+                    # A batch still being collected: LogCollector is writing into it
+                    # and it holds no compressed bytes, so removing it frees nothing
+                    continue
                 try:
-                    shutil.rmtree(entry) if entry.is_dir() else entry.unlink()
+                    self._discard(path, is_dir)
+                    deleted.add(path)
                     total_size -= size
                     if __debug__:
                         deleted_count += 1
                         space_freed_bytes += size
-                        logger.debug("Deleted entry %s (%.1f KB)", entry, size / 1024)
+                        if debug_entries:
+                            logger.debug("Deleted entry %s (%.1f KB)", path, size / 1024)
                 except (FileNotFoundError, PermissionError, OSError) as e:
-                    logger.warning("Failed to delete %s: %s", entry, e)
+                    logger.warning("Failed to delete %s: %s", path, e)
+            if deleted:
+                batches[:] = [batch for batch in batches if batch[0] not in deleted]
 
             if __debug__:
                 self.cleanup_runs += 1
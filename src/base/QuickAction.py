@@ -1,7 +1,9 @@
 """Abstract base class for quick actions in the log collection process."""
 
 import asyncio
+import errno
 import logging
+import shutil
 import time
 from pathlib import Path
 import os
@@ -9,13 +11,26 @@ from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+CAT_CHUNK_SIZE = 1 << 20  # per-call byte count for copying "cat" sources
+TAIL_BLOCK_SIZE = 64 * 1024  # read size when scanning a file backwards for "tail"
+
 
 class QuickAction(ABC):
     """Base class for quick actions in the log collection process."""
 
+    # Subclasses declare their own __slots__ too, so instances carry no __dict__
+    __slots__ = ("batches_root", "log_filename", "_log_suffix", "_pending_run", "_command",
+                 "executions", "total_execution_time", "failures")
+
     def __init__(self, batches_root: str, log_filename: str):
         self.batches_root = batches_root
         self.log_filename = log_filename
+        # execute() builds its output path with one concat instead of os.path.join
+        self._log_suffix = os.sep + log_filename
+        # Command run still in flight; batches that arrive meanwhile reuse its output
+        self._pending_run: asyncio.Future | None = None
+        # get_command() result, built on first execute(); the argv never changes
+        self._command: tuple[list[str], str] | None = None
         
         # Metrics tracking
         if __debug__:
@@ -23,34 +38,46 @@ class QuickAction(ABC):
             self.total_execution_time = 0
             self.failures = 0
 
-    def get_output_path(self, batch_id: str) -> str:
-        """Return the output path for the quick action."""
-        return os.path.join(self.batches_root, f"aod_quick_{batch_id}", self.log_filename)
-
     def get_output_dir(self, batch_id: str) -> str:
-        """Return the output directory for the quick action."""
+        """Return the output directory for the quick action.
+
+        Actions do not create it; the caller makes it once before executing them.
+        """
         return os.path.join(self.batches_root, f"aod_quick_{batch_id}")
 
     @abstractmethod
     def get_command(self) -> tuple[list[str], str]:
         """Return the command to run as a list.
-        FOR CAT CMDS, RETURN A LIST OF SIZE 2: ["cat", "/path/to/file"]"""
+        FOR CAT CMDS, RETURN A LIST OF SIZE 2: ["cat", "/path/to/file"]
+        FOR TAIL CMDS, RETURN A LIST OF SIZE 3: ["tail", "-n<lines>", "/path/to/file"]"""
+
+    async def execute(self, output_dir: str) -> str | None:
+        """Run process to collect logs into output_dir, the batch directory
+        from get_output_dir() (computed once per batch by the caller).
 
-    async def execute(self, batch_id: str) -> None:
-        """Run process to collect logs."""
+        Returns the path of the written log, or None if nothing was written.
+        """
         if __debug__:
             start_time = time.time()
         
+        written = False
         try:
-            output_path = self.get_output_path(batch_id)
-            cmd, cmd_type = self.get_command()
+            output_path = output_dir + self._log_suffix
+            command = self._command
+            if command is None:
+                command = self._command = self._load_command()
+            cmd, cmd_type = command
             
             if cmd_type == "cat":
                 # Expecting: ["cat", "/path/to/file"]
                 _, in_path = cmd
-                await self.collect_cat_output(in_path, output_path)
+                written = await self.collect_cat_output(in_path, output_path)
+            elif cmd_type == "tail":
+                # Expecting: ["tail", "-n<lines>", "/path/to/file"]
+                _, num_lines, in_path = cmd
+                written = await self.collect_tail_output(in_path, output_path, int(num_lines[2:]))
             elif cmd_type == "cmd":
-                await self.collect_cmd_output(cmd, output_path)
+                written = await self.collect_cmd_output(cmd, output_path)
                 
             if __debug__:
                 self.executions += 1
@@ -59,8 +86,9 @@ class QuickAction(ABC):
             if __debug__:
                 self.failures += 1
             logger.warning("QuickAction %s failed for batch %s: %s", 
-                         self.__class__.__name__, batch_id, e)
+                         self.__class__.__name__, output_dir, e)
             # Don't raise - continue processing other actions
+            written = False
         finally:
             if __debug__:
                 self.total_execution_time += time.time() - start_time
@@ -69,39 +97,115 @@ class QuickAction(ABC):
                     success_rate = (self.executions / (self.executions + self.failures) * 100) if (self.executions + self.failures) > 0 else 0
                     logger.debug("%s metrics: success=%d, failures=%d, success_rate=%.1f%%, avg_time=%.2fs", 
                                self.__class__.__name__, self.executions, self.failures, success_rate, avg_time)
+        return output_path if written else None
 
-    async def collect_cat_output(self, in_path: str, out_path: str) -> None:
-        in_path = Path(in_path)
-        out_path = Path(out_path)
+    def _load_command(self) -> tuple[list[str], str]:
+        """Return get_command() with the executable of "cmd" actions resolved to an
+        absolute path, which lets subprocess launch it via posix_spawn (vfork+exec)
+        instead of fork+exec."""
+        cmd, cmd_type = self.get_command()
+        if cmd_type == "cmd":
+            cmd = [shutil.which(cmd[0]) or cmd[0], *cmd[1:]]
+        return cmd, cmd_type
+
+    async def collect_cat_output(self, in_path: str, out_path: str) -> bool:
         if __debug__:
             logger.debug("Collecting proc fs output from: %s", in_path)
         try:
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            data = in_path.read_bytes()
-            out_path.write_bytes(data)
+            # Blocking copy; keep it off the collector loop
+            await asyncio.to_thread(self._copy_file, in_path, out_path)
             if __debug__:
                 logger.debug("Output written to: %s", out_path)
+            return True
         except Exception as e:
             # Don't raise - let execute() handle the failure gracefully
             logger.debug("Failed to collect cat output from %s: %s", in_path, e)
             raise  # Re-raise to be caught by execute()
 
-    async def collect_cmd_output(self, cmd: list, out_path: str) -> None:
-        out_path = Path(out_path)
+    @staticmethod
+    def _copy_file(in_path: str, out_path: str) -> None:
+        """Copy in_path to out_path; the batch directory is created once per batch by LogCollector."""
+        with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+            try:
+                # Copy in the kernel; procfs reports st_size 0, so go until EOF
+                while os.sendfile(dst.fileno(), src.fileno(), None, CAT_CHUNK_SIZE):
+                    pass
+            except OSError as e:
+                if e.errno not in (errno.EINVAL, errno.ENOSYS):
+                    raise
+                # Some seq_file entries can't be spliced; finish through userspace
+                shutil.copyfileobj(src, dst, CAT_CHUNK_SIZE)
+
+    async def collect_tail_output(self, in_path: str, out_path: str, num_lines: int) -> bool:
         if __debug__:
+            logger.debug("Collecting last %d lines of: %s", num_lines, in_path)
+        try:
+            # Blocking file I/O; keep it off the collector loop
+            await asyncio.to_thread(self._tail_file, in_path, out_path, num_lines)
+            if __debug__:
+                logger.debug("Output written to: %s", out_path)
+            return True
+        except Exception as e:
+            # Don't raise - let execute() handle the failure gracefully
+            logger.debug("Failed to collect tail output from %s: %s", in_path, e)
+            raise  # Re-raise to be caught by execute()
+
+    @staticmethod
+    def _tail_file(in_path: str, out_path: str, num_lines: int, block_size: int = TAIL_BLOCK_SIZE) -> None:
+        """Write the last num_lines lines of in_path to out_path, like tail -n."""
+        with open(in_path, "rb") as src:
+            # Read backwards in blocks until the block holds num_lines full lines
+            pos = src.seek(0, os.SEEK_END)
+            data = b""
+            while pos > 0 and data.count(b"\n") <= num_lines:
+                step = min(block_size, pos)
+                pos -= step
+                src.seek(pos)
+                data = src.read(step) + data
+        end = len(data) - 1 if data.endswith(b"\n") else len(data)
+        start = end
+        for _ in range(num_lines):
+            start = data.rfind(b"\n", 0, start)
+            if start < 0:
+                break
+        with open(out_path, "wb") as dst:
+            dst.write(data[start + 1:])
+
+    async def collect_cmd_output(self, cmd: list, out_path: str) -> bool:
+        out_path = Path(out_path)
+        # ' '.join() runs before logger.debug() can filter, so check the level first
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
             logger.debug("Collecting command output for: %s", ' '.join(cmd))
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.DEVNULL
-            )
-            stdout, _ = await proc.communicate()
+            run = self._pending_run
+            if run is None:
+                run = self._pending_run = asyncio.ensure_future(self._run_cmd(cmd))
+                run.add_done_callback(self._release_run)
+            # shield: a cancelled batch must not kill the run other batches are waiting on
+            stdout = await asyncio.shield(run)
             if stdout:
                 out_path.write_bytes(stdout)
             if __debug__:
                 logger.debug("Command output written to: %s", out_path)
+            return bool(stdout)
         except Exception as e:
             # Don't raise - let execute() handle the failure gracefully
-            logger.debug("Failed to execute command '%s': %s", ' '.join(cmd), e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed to execute command '%s': %s", ' '.join(cmd), e)
             raise  # Re-raise to be caught by execute()
+
+    async def _run_cmd(self, cmd: list) -> bytes:
+        """Run the command once and return its stdout."""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            close_fds=False
+        )
+        stdout, _ = await proc.communicate()
+        return stdout
+
+    def _release_run(self, run: asyncio.Future) -> None:
+        if self._pending_run is run:
+            self._pending_run = None
@@ -4,6 +4,8 @@ from base.QuickAction import QuickAction
 logger = logging.getLogger(__name__)
 
 class CifsstatsQuickAction(QuickAction):
+    __slots__ = ()
+
     def __init__(self, batches_root: str):
         """Args:
             batches_root (str): Root directory for log batches.
@@ -3,6 +3,8 @@ from base.QuickAction import QuickAction
 class DebugDataQuickAction(QuickAction):
     """Quick action to collect CIFS debug data."""
 
+    __slots__ = ()
+
     def __init__(self, batches_root: str):
         """Args:
             batches_root (str): Root directory for log batches.
@@ -1,6 +1,7 @@
 from base.QuickAction import QuickAction
 
 class DmesgQuickAction(QuickAction):
+    __slots__ = ("anomaly_interval",)
 
     def __init__(self, batches_root: str, anomaly_interval: int = 1):
         """Args:
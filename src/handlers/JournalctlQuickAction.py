@@ -5,6 +5,7 @@ from base.QuickAction import QuickAction
 logger = logging.getLogger(__name__)
 
 class JournalctlQuickAction(QuickAction):
+    __slots__ = ("anomaly_interval",)
 
     def __init__(self, batches_root: str, anomaly_interval: int = 1):
         """Args:
@@ -1,6 +1,8 @@
 from base.QuickAction import QuickAction
 
 class MountsQuickAction(QuickAction):
+    __slots__ = ()
+
     def __init__(self, batches_root: str):
         """Args:
             batches_root (str): Root directory for log batches.
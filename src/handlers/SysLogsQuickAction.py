@@ -4,6 +4,8 @@ from base.QuickAction import QuickAction
 logger = logging.getLogger(__name__)
 
 class SysLogsQuickAction(QuickAction):
+    __slots__ = ("num_lines",)
+
     def __init__(self, batches_root: str, num_lines: int = 100):
         """Args:
             batches_root (str): Root directory for log batches.
@@ -14,9 +16,10 @@ class SysLogsQuickAction(QuickAction):
         if __debug__:
             logger.debug("SysLogsQuickAction initialized with num_lines=%d", num_lines)
 
-    def get_command(self) -> list:
+    def get_command(self) -> tuple[list[str], str]:
+        # Read in-process by the base class; no tail(1) process is spawned
         return [
             "tail",
             f"-n{self.num_lines}",
             "/var/log/syslog",
-        ], "cmd"
+        ], "tail"
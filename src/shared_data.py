@@ -69,6 +69,10 @@ class Event(ctypes.Structure):
 
 
 # we need to ensure that event_dtype and event cstruct is of the same size
+# The ring stays array-of-structs: smbsloweraod (prebuilt in bin/) writes whole
+# `struct event` records byte-wise and can wrap mid-record, so a per-field
+# (struct-of-arrays) layout would need a producer rebuild. Consumers should take
+# column views (batch["metric_latency_ns"]) once per batch instead of per event.
 event_dtype = np.dtype(
     [
         ("pid", np.int32),
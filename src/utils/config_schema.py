@@ -42,3 +42,5 @@ class Config:
     guardian: GuardianConfig
     cleanup: dict  # could make a dataclass if desired
     audit: dict  # could make a dataclass if desired
+    dispatcher_core: Optional[int] = None  # CPU to pin the EventDispatcher thread to
+    dispatcher_rt_priority: Optional[int] = None  # SCHED_FIFO priority, needs CAP_SYS_NICE
@@ -3,6 +3,13 @@
 import ctypes
 import ctypes.util
 
+# Resolved in the parent at import time. Doing it in preexec_fn would make every
+# forked child run find_library(), which itself forks ldconfig before the exec.
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"))
+except OSError:
+    _libc = None
+
 
 def pdeathsig_preexec():
     """Set PR_SET_PDEATHSIG to SIGTERM so child dies when parent dies.
@@ -11,10 +18,11 @@ def pdeathsig_preexec():
     in subprocess.Popen() to ensure that child processes are automatically
     terminated when the parent process dies unexpectedly.
     """
+    if _libc is None:
+        return
     try:
-        libc = ctypes.CDLL(ctypes.util.find_library("c"))
         # PR_SET_PDEATHSIG = 1, SIGTERM = 15
-        libc.prctl(1, 15, 0, 0, 0)
+        _libc.prctl(1, 15, 0, 0, 0)
     except Exception:
         # Silently fail if prctl is not available or fails
         pass
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from src.base import QuickAction, AnomalyHandlerBase
 
@@ -8,5 +10,40 @@ class TestBase(unittest.TestCase):
     def test_quick_action(self):
         self.assertTrue(hasattr(QuickAction, 'QuickAction'))
 
+class TestTailFile(unittest.TestCase):
+    """QuickAction._tail_file must match tail -n byte for byte."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.in_path = os.path.join(self.tmp.name, "in.log")
+        self.out_path = os.path.join(self.tmp.name, "out.log")
+
+    def tail(self, data, num_lines, block_size=QuickAction.TAIL_BLOCK_SIZE):
+        with open(self.in_path, "wb") as f:
+            f.write(data)
+        QuickAction.QuickAction._tail_file(self.in_path, self.out_path, num_lines, block_size)
+        with open(self.out_path, "rb") as f:
+            return f.read()
+
+    def test_last_lines(self):
+        self.assertEqual(self.tail(b"a\nb\nc\nd\n", 2), b"c\nd\n")
+
+    def test_no_trailing_newline(self):
+        self.assertEqual(self.tail(b"a\nb\nc", 2), b"b\nc")
+        self.assertEqual(self.tail(b"abc", 1), b"abc")
+
+    def test_fewer_lines_than_requested(self):
+        self.assertEqual(self.tail(b"a\nb\n", 5), b"a\nb\n")
+        self.assertEqual(self.tail(b"", 5), b"")
+
+    def test_lines_crossing_block_boundary(self):
+        data = b"".join(b"line %03d %s\n" % (i, b"x" * i) for i in range(50))
+        for block_size in (1, 7, 64):
+            for num_lines in (1, 3, 10, 49, 50, 60):
+                expected = b"".join(data.splitlines(keepends=True)[-num_lines:])
+                self.assertEqual(self.tail(data, num_lines, block_size), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,9 @@ import unittest
 from src.SpaceWatcher import SpaceWatcher
 from src.Controller import Controller
 import os
+import tempfile
+import threading
+from types import SimpleNamespace
 
 class TestSpaceWatcher(unittest.TestCase):
     def setUp(self):
@@ -12,5 +15,106 @@ class TestSpaceWatcher(unittest.TestCase):
     def test_init(self):
         self.assertIsNotNone(self.watcher)
 
+
+class TestSpaceWatcherCleanup(unittest.TestCase):
+    """Behavior of the batch snapshot and cleanups on a real batches/ tree."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        controller = SimpleNamespace(
+            config=SimpleNamespace(cleanup={"aod_output_dir": self.tmp.name, "max_total_log_size_mb": 1}),
+            stop_event=threading.Event(),
+        )
+        self.watcher = SpaceWatcher(controller)
+        self.batches = self.watcher.batches_dir
+        os.makedirs(self.batches)
+        self.scans = 0
+        scan = self.watcher._scan_batches
+
+        def counting_scan():
+            self.scans += 1
+            return scan()
+        self.watcher._scan_batches = counting_scan
+
+    def make_archive(self, ts, size=1, mtime=None):
+        path = os.path.join(self.batches, f"aod_quick_{ts}.tar.zst")
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def settle(self):
+        # Park batches/ at an old mtime so the next change is always visible,
+        # however coarse the filesystem's timestamps are
+        os.utime(self.batches, ns=(0, 0))
+
+    def names(self, batches):
+        return sorted(os.path.basename(batch[0]) for batch in batches)
+
+    def test_snapshot_reused_when_unchanged(self):
+        self.make_archive(1)
+        self.settle()
+        first = self.watcher._collect_batches()
+        second = self.watcher._collect_batches()
+        self.assertEqual(self.scans, 1)
+        self.assertEqual(first, second)
+
+    def test_snapshot_invalidated_by_entry_changes(self):
+        old = self.make_archive(1)
+        changes = {
+            "add": lambda: self.make_archive(2),
+            "remove": lambda: os.unlink(os.path.join(self.batches, "aod_quick_2.tar.zst")),
+            "rename": lambda: os.rename(old, os.path.join(self.batches, "aod_quick_3.tar.zst")),
+        }
+        expected = {
+            "add": ["aod_quick_1.tar.zst", "aod_quick_2.tar.zst"],
+            "remove": ["aod_quick_1.tar.zst"],
+            "rename": ["aod_quick_3.tar.zst"],
+        }
+        for name, change in changes.items():
+            with self.subTest(change=name):
+                self.settle()
+                self.watcher._collect_batches()
+                scans = self.scans
+                change()
+                self.assertEqual(self.names(self.watcher._collect_batches()), expected[name])
+                self.assertEqual(self.scans, scans + 1)
+
+    def test_snapshot_with_directory_not_reused(self):
+        os.mkdir(os.path.join(self.batches, "aod_quick_1"))
+        archive = self.make_archive(1, size=10)
+        self.settle()
+        self.watcher._collect_batches()
+        # The archive grows in place while its staging dir exists
+        with open(archive, "ab") as f:
+            f.write(b"x" * 90)
+        os.utime(self.batches, ns=(0, 0))
+        sizes = {os.path.basename(b[0]): b[2] for b in self.watcher._collect_batches()}
+        self.assertEqual(self.scans, 2)
+        self.assertEqual(sizes["aod_quick_1.tar.zst"], 100)
+
+    def test_cleanup_by_size_skips_dirs_and_stops_at_half(self):
+        staging = os.path.join(self.batches, "aod_quick_0")
+        os.mkdir(staging)
+        os.utime(staging, (1000, 1000))  # oldest entry
+        size = 300 * 1024
+        for ts in range(1, 6):  # 5 x 300 KiB against a 1 MiB quota
+            self.make_archive(ts, size=size, mtime=1000 + ts)
+        self.watcher.cleanup_by_size()
+        # Oldest archives go until the total is <= 50% (512 KiB): one is left
+        self.assertEqual(sorted(os.listdir(self.batches)), ["aod_quick_0", "aod_quick_5.tar.zst"])
+
+    def test_reap_graveyard_removes_nested_tree(self):
+        nested = os.path.join(self.watcher._graveyard, "aod_quick_1.1.1", "a", "b")
+        os.makedirs(nested)
+        for path in (nested, os.path.dirname(nested)):
+            with open(os.path.join(path, "log"), "w") as f:
+                f.write("x")
+        self.watcher._reap_graveyard()
+        self.assertEqual(os.listdir(self.watcher._graveyard), [])
+
+
 if __name__ == '__main__':
     unittest.main()